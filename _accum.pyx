@@ -0,0 +1,25 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled version of the nutrient accumulation kernel.
+
+Build it in place with `cythonize -i _accum.pyx`. If the extension is not built,
+calculate_calorie_intake falls back to the Numba kernel.
+"""
+
+
+def accum(const long long[:] idx_arr, const double[:] qty_arr, const double[:, :] matrix, double[:] out):
+    """
+    Adds the nutrient rows of the given foods, scaled by their quantities, to out.
+    
+    Args:
+        idx_arr (np.ndarray): Row indices into matrix, one per food.
+        qty_arr (np.ndarray): Quantities in grams, one per food.
+        matrix (np.ndarray): The (foods, nutrients) matrix of values per 100 g.
+        out (np.ndarray): The nutrient totals, updated in place.
+    """
+    cdef Py_ssize_t i, j
+    cdef double scale
+    for i in range(idx_arr.shape[0]):
+        scale = qty_arr[i] * 0.01
+        for j in range(out.shape[0]):
+            out[j] += matrix[idx_arr[i], j] * scale
@@ -1,6 +1,49 @@
-import json  
+import json
 from collections import defaultdict
 from difflib import get_close_matches
+from functools import lru_cache, partial
+from operator import itemgetter
+
+try:
+    import numpy as np
+    _HAVE_NUMPY = True
+except ImportError:
+    _HAVE_NUMPY = False
+
+try:
+    import orjson
+    _HAVE_ORJSON = True
+except ImportError:
+    _HAVE_ORJSON = False
+
+try:
+    from numba import njit
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+try:
+    from rapidfuzz import process, fuzz
+    _HAVE_RF = True
+except ImportError:
+    _HAVE_RF = False
+
+try:
+    from _accum import accum as _accum
+except ImportError:
+    _accum = None
+
+if _accum is None and _HAVE_NUMBA:
+    @njit(cache=True)
+    def _accum(idx_arr, qty_arr, matrix, out):
+        """Numba fallback for accum in _accum.pyx, which documents the arguments."""
+        for i in range(idx_arr.size):
+            scale = qty_arr[i] * 0.01
+            for j in range(out.size):
+                out[j] += matrix[idx_arr[i], j] * scale
+
+if not _HAVE_NUMPY:
+    _accum = None
 
 
 class FoodDatabase:
@@ -12,7 +55,22 @@ class FoodDatabase:
     
     Attributes:
         unit_conversions (dict): A dictionary mapping common food terms to their approximate weight in grams.
+        file (str): The path to the JSON file the nutrition data was loaded from.
+        NUTRIENT_KEYS (tuple): The nutrients stored for every food, in column order of nutrients.
+        BATCH_MATCH_THRESHOLD (int): The number of unknown food items from which find_closest_matches
+            scores them all in a single rapidfuzz.process.cdist call.
+        nutrients (np.ndarray or None): A (foods, nutrients) float64 array of values per 100 g, one row
+            per food, or None if numpy is not installed.
+        known_keys (frozenset): The nutrition_dict and unit_conversions keys, for the exact-match fast path
+            of find_closest_match.
+        key_to_row (dict): A dictionary mapping nutrition_dict keys to their row in nutrients.
+        nutrient_tuples (dict): A dictionary mapping nutrition_dict keys to a tuple of their NUTRIENT_KEYS values
+            as floats.
+        unit_to_nutrient_key (dict): A dictionary mapping unit_conversions terms to the nutrition_dict
+            key with the same name, or None if there is none.
     """
+    NUTRIENT_KEYS = ("calories", "total_fat", "protein", "carbohydrate", "sugars")
+    BATCH_MATCH_THRESHOLD = 8
     unit_conversions = {"egg": 50, "banana": 118, "apple": 200, "orange": 130, "kiwi": 70,
                         "slice of bread": 30, "loaf of bread": 500, "cup of rice": 200, "cup of oats": 80, 
                         "cup of flour": 120, "tablespoon of butter": 14, "tablespoon of peanut butter": 16, 
@@ -26,7 +84,42 @@ class FoodDatabase:
         Args:
             file (str): The path to the JSON file containing nutrition data.
         """
+        self.file = file
         self.nutrition_dict = self.read_file(file)
+        self.refresh_caches()
+        
+    def refresh_caches(self):
+        """
+        Rebuilds the data derived from nutrition_dict.
+        
+        Modifies:
+                The _food_list attribute, combining nutrition_dict and unit_conversions keys,
+                and the memoized matcher, so earlier matches are discarded.
+                The known_keys attribute, a frozenset of the same keys.
+                The nutrient_tuples, nutrients and key_to_row attributes, holding one row of
+                NUTRIENT_KEYS values per food in nutrition_dict.
+                The unit_to_nutrient_key attribute.
+        """
+        self._food_list = tuple(self.nutrition_dict) + tuple(self.unit_conversions)
+        self.known_keys = frozenset(self._food_list)
+        self._cached_match = lru_cache(maxsize=4096)(partial(self._match, food_list=self.all_keys))
+        self.key_to_row = {food: i for i, food in enumerate(self.nutrition_dict)}
+        get_nutrients = itemgetter(*self.NUTRIENT_KEYS)
+        self.nutrient_tuples = {food: tuple(map(float, get_nutrients(row))) for food, row in self.nutrition_dict.items()}
+        if _HAVE_NUMPY:
+            self.nutrients = np.array(list(self.nutrient_tuples.values()),
+                                      dtype=np.float64).reshape(-1, len(self.NUTRIENT_KEYS))
+        else:
+            self.nutrients = None
+        self.unit_to_nutrient_key = {unit: unit if unit in self.nutrition_dict else None
+                                     for unit in self.unit_conversions}
+        
+    @property
+    def all_keys(self):
+        """
+        tuple: The cached nutrition_dict and unit_conversions keys, in that order.
+        """
+        return self._food_list
         
     def read_file(self, file):
         """
@@ -38,8 +131,8 @@ class FoodDatabase:
         Returns:
                 dict: A dictionary containing nutrition data.
         """
-        with open(file, 'r') as json_file:
-            nutrition_dict = json.load(json_file)
+        with open(file, 'rb') as json_file:
+            nutrition_dict = orjson.loads(json_file.read()) if _HAVE_ORJSON else json.load(json_file)
             return nutrition_dict
         
     def write_file(self, file, data):
@@ -53,23 +146,87 @@ class FoodDatabase:
         Modifies:
                 The JSON file at the given path.
         """
-        with open(file, "w") as f: 
-            json.dump(data, f, indent=4)
+        if _HAVE_ORJSON:
+            with open(file, "wb") as f: 
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(file, "w") as f: 
+                json.dump(data, f, indent=4)
             
-    def find_closest_match(self, food, food_list):
+    def find_closest_match(self, food, food_list=None):
         """
         Finds the closest match for a food item using fuzzy matching.
         
         Args:
             food (str): The food item to search for.
-            food_list (list): A list of available food items.
+            food_list (iterable, optional): The food items to search in. Defaults to all_keys.
             
         Returns:
                 str or None: The closest matching food item, or None if no match is found.
         """
-        food_list = list(self.nutrition_dict.keys()) + list(self.unit_conversions.keys())
-        matches = get_close_matches(food, food_list, n=1, cutoff=0.6)
-        return matches[0] if matches else None
+        if food_list is None:
+            if food in self.known_keys:
+                return food
+            return self._cached_match(food)
+        if food in food_list:
+            return food
+        return self._match(food, food_list)
+        
+    def find_closest_matches(self, foods):
+        """
+        Finds the closest match in all_keys for several food items at once.
+        
+        Args:
+            foods (list): The food items to search for.
+            
+        Returns:
+                list: The closest matching food item for each of foods, or None where no match is found.
+        """
+        matches = [food if food in self.known_keys else None for food in foods]
+        misses = [i for i, match in enumerate(matches) if match is None]
+        
+        if len(misses) < self.BATCH_MATCH_THRESHOLD or not (_HAVE_RF and _HAVE_NUMPY):
+            for i in misses:
+                matches[i] = self._cached_match(foods[i])
+            return matches
+        
+        scores = process.cdist([foods[i] for i in misses], self.all_keys,
+                               scorer=fuzz.ratio, score_cutoff=60, workers=-1)
+        best = scores.argmax(axis=1)
+        for row, (i, j) in enumerate(zip(misses, best.tolist())):
+            if scores[row, j] >= 60:
+                matches[i] = self.all_keys[j]
+        return matches
+        
+    def _match(self, food, food_list):
+        """
+        Runs the fuzzy matcher for a food item against the given food items.
+        
+        Args:
+            food (str): The food item to search for.
+            food_list (iterable): The food items to search in.
+            
+        Returns:
+                str or None: The closest matching food item, or None if no match is found.
+        """
+        if not _HAVE_RF:
+            matches = get_close_matches(food, food_list, n=1, cutoff=0.6)
+            return matches[0] if matches else None
+        match = process.extractOne(food, food_list, scorer=fuzz.ratio, score_cutoff=60)
+        return match[0] if match else None
+
+
+def _nutrient_label(key):
+    """
+    Formats a nutrient key as a padded label for print_clean_output.
+    
+    Args:
+        key (str): The nutrient key, e.g. "total_fat".
+        
+    Returns:
+        str: The title-cased label, left-justified to 17 characters.
+    """
+    return f"{key.replace('_', ' ').title()}:".ljust(17)
 
 
 class Nutrition():
@@ -84,6 +241,9 @@ class Nutrition():
     Attributes:
         fdb (FoodDatabase): An instance of FoodDatabase for managing nutrition data.
     """
+    _LABELS = {key: _nutrient_label(key) for key in FoodDatabase.NUTRIENT_KEYS}
+    _UNITS = {"calories": "kcal"}
+    
     def __init__(self, file):
         """
         Initializes the Nutrition by loading nutrition data from a file.
@@ -106,22 +266,97 @@ class Nutrition():
         Returns:
             dict: A dictionary containing the total nutritional values for the meal.
         """
-        output_dict = defaultdict(float)  
-        food_list = list(self.fdb.nutrition_dict.keys()) + list(self.fdb.unit_conversions.keys())  
+        matches = self.fdb.find_closest_matches(list(ndict))
+        rows = [self.to_grams(matched_key, value) for matched_key, value in zip(matches, ndict.values())]
+        rows = [row for row in rows if row is not None]
+        if not rows:
+            return {}
         
-        for key, value in ndict.items():
-            matched_key = self.fdb.find_closest_match(key, food_list)
-            
-            if matched_key in self.fdb.unit_conversions:
-                grams = self.fdb.unit_conversions[matched_key] * value if value < 10 else value
-                matched_key = self.fdb.find_closest_match(matched_key, list(self.fdb.nutrition_dict.keys()))
-                value = grams  
-
-            if matched_key in self.fdb.nutrition_dict:
-                for k, v in self.fdb.nutrition_dict[matched_key].items():
-                    output_dict[k] += (float(v) * value) / 100
+        if _accum is None:
+            output_dict = defaultdict(float)
+            for matched_key, grams in rows:
+                self.add_nutrients(matched_key, grams, output_dict)
+            return dict(output_dict)
+        
+        idx_arr = np.array([self.fdb.key_to_row[matched_key] for matched_key, _ in rows], dtype=np.int64)
+        qty_arr = np.array([grams for _, grams in rows], dtype=np.float64)
+        totals = np.zeros(len(self.fdb.NUTRIENT_KEYS), dtype=np.float64)
+        _accum(idx_arr, qty_arr, self.fdb.nutrients, totals)
 
-        return dict(output_dict)
+        return dict(zip(self.fdb.NUTRIENT_KEYS, totals.tolist()))
+    
+    def resolve(self, key, value):
+        """
+        Matches a food item against the database and converts its quantity to grams.
+        
+        Args:
+            key (str): The food item, matched against the database with fuzzy matching.
+            value (float): The quantity in grams, or in units if below 10 and the food has a unit conversion.
+        
+        Returns:
+            tuple or None: The matched nutrition_dict key and the quantity in grams, or None if no match is found.
+        """
+        return self.to_grams(self.fdb.find_closest_match(key), value)
+    
+    def to_grams(self, matched_key, value):
+        """
+        Converts the quantity of an already matched food item to grams.
+        
+        Args:
+            matched_key (str or None): A key of nutrition_dict or unit_conversions, as returned by find_closest_match.
+            value (float): The quantity in grams, or in units if below 10 and the food has a unit conversion.
+        
+        Returns:
+            tuple or None: The nutrition_dict key and the quantity in grams, or None if there is no nutrition data.
+        """
+        if matched_key in self.fdb.nutrition_dict and (value >= 10 or matched_key not in self.fdb.unit_conversions):
+            return matched_key, value
+        
+        if matched_key in self.fdb.unit_conversions:
+            grams = self.fdb.unit_conversions[matched_key] * value if value < 10 else value
+            matched_key = self.fdb.unit_to_nutrient_key[matched_key]
+            value = grams  
+
+        if matched_key in self.fdb.nutrition_dict:
+            return matched_key, value
+        return None
+    
+    def accumulate_one(self, key, value, output_dict):
+        """
+        Adds the nutritional content of a single food item to a running total.
+        
+        Args:
+            key (str): The food item, matched against the database with fuzzy matching.
+            value (float): The quantity in grams, or in units if below 10 and the food has a unit conversion.
+            output_dict (defaultdict): The running totals to update in place.
+        
+        Modifies:
+            output_dict, by adding the nutritional values of the food item.
+        """
+        row = self.resolve(key, value)
+        
+        if row is not None:
+            self.add_nutrients(*row, output_dict)
+    
+    def add_nutrients(self, matched_key, grams, output_dict):
+        """
+        Adds the nutritional content of a given weight of a nutrition_dict food to a running total.
+        
+        Args:
+            matched_key (str): A key of nutrition_dict.
+            grams (float): The quantity in grams.
+            output_dict (defaultdict): The running totals to update in place.
+        
+        Modifies:
+            output_dict, by adding the nutritional values of the food item.
+        """
+        cal, fat, prot, carb, sug = self.fdb.nutrient_tuples[matched_key]
+        scale = grams * 0.01
+        output_dict["calories"] += cal * scale
+        output_dict["total_fat"] += fat * scale
+        output_dict["protein"] += prot * scale
+        output_dict["carbohydrate"] += carb * scale
+        output_dict["sugars"] += sug * scale
     
     def print_clean_output(self, final_dict):
         """
@@ -134,11 +369,8 @@ class Nutrition():
             A formatted nutritional summary.
         """
         for key, value in final_dict.items():
-            
-            if key == "calories":
-                print(f"{key.title()}:".ljust(17) + f"{int(value):>6} kcal")
-            else:
-                print(f"{key.replace('_', ' ').title()}:".ljust(17) + f"{int(value):>6} g")
+            label = self._LABELS.get(key) or _nutrient_label(key)
+            print(f"{label}{int(value):>6} {self._UNITS.get(key, 'g')}")
     
     def add_new_food(self, food, cal, fat, prot, carb, sug):
         """
@@ -156,7 +388,7 @@ class Nutrition():
             dict: A dictionary containing the nutritional details of the new food item.
 
         Modifies:
-            The "nutrition.json" file by adding the new food item.
+            The nutrition database file by adding the new food item.
         """
         new_item = {
             food: {
@@ -168,14 +400,9 @@ class Nutrition():
             }
         }
         
-        try:
-            existing_data = self.fdb.read_file("nutrition.json")
-        except (FileNotFoundError, json.JSONDecodeError):  
-            existing_data = {}  
-            
-        existing_data.update(new_item)
-        self.fdb.write_file("nutrition.json", existing_data)  
         self.fdb.nutrition_dict.update(new_item)
+        self.fdb.write_file(self.fdb.file, self.fdb.nutrition_dict)  
+        self.fdb.refresh_caches()
         print("✅ New food added successfully!")
         
         return new_item
@@ -190,8 +417,8 @@ class Interactive:
     and view a running nutritional summary.
     
     Attributes:
-        fdb (FoodDatabase): Instance of FoodDatabase for retrieving nutritional information.
         nutr (Nutrition): Instance of Nutrition for processing and displaying nutritional data.
+        fdb (FoodDatabase): The FoodDatabase shared with nutr, for retrieving nutritional information.
     """
     
     def __init__(self, file):
@@ -201,8 +428,8 @@ class Interactive:
         Args:
             file (str): The path to the nutrition database file.
         """
-        self.fdb = FoodDatabase(file)
         self.nutr = Nutrition(file)
+        self.fdb = self.nutr.fdb
     
     def handle_invalid_input(self, emoji, act1, act2):
         """
@@ -233,7 +460,7 @@ class Interactive:
         Prints:
             A running total of the user's nutritional intake.
         """
-        meals = defaultdict(float)
+        running_totals = defaultdict(float)
 
         print("Welcome to Calorie Intake Calculator! 😊 \n")
         print("How to use? 🤔\n")
@@ -247,7 +474,6 @@ class Interactive:
 
             try:
                 quantity = float(quantity)
-                meals[food] += quantity
             except ValueError:
                 print("❌ Invalid quantity. Please enter a number.\n")
                 continue
@@ -271,7 +497,8 @@ class Interactive:
 
                     self.nutr.add_new_food(food, cal, fat, prot, carb, sug)
 
-            summary = self.nutr.nutritional_summary(meals)
+            self.nutr.accumulate_one(food, quantity, running_totals)
+            summary = dict(running_totals)
             print("\n🟢 Current Total:")
             self.nutr.print_clean_output(summary)
 